@@ -15,7 +15,7 @@ import {SupplyCalculator} from "../src/calculators/SupplyCalculator.sol";
  *
  * # Option 1: Safe upgrade with reference build (recommended)
  * # First, create reference build from deployed ZKC commit:
- * export DEPLOYED_COMMIT=$(python3 -c "import tomlkit; print(tomlkit.load(open('deployment.toml'))['deployment']['$CHAIN_KEY']['zkc-commit'])")
+ * export DEPLOYED_COMMIT=$(python3 -c "import tomllib; print(tomllib.load(open('deployment.toml', 'rb'))['deployment']['$CHAIN_KEY']['zkc-commit'])")
  * WORKTREE_PATH="../zkc-reference-${DEPLOYED_COMMIT}"
  * git worktree add "$WORKTREE_PATH" "$DEPLOYED_COMMIT"
  * cd "$WORKTREE_PATH"
@@ -148,7 +148,7 @@ contract UpgradeZKC is BaseZKCUpgrade {
  *
  * # Option 1: Safe upgrade with reference build (recommended)
  * # First, create reference build from deployed ZKC commit:
- * export DEPLOYED_COMMIT=$(python3 -c "import tomlkit; print(tomlkit.load(open('deployment.toml'))['deployment']['$CHAIN_KEY']['zkc-commit'])")
+ * export DEPLOYED_COMMIT=$(python3 -c "import tomllib; print(tomllib.load(open('deployment.toml', 'rb'))['deployment']['$CHAIN_KEY']['zkc-commit'])")
  * WORKTREE_PATH="../zkc-reference-${DEPLOYED_COMMIT}"
  * git worktree add "$WORKTREE_PATH" "$DEPLOYED_COMMIT"
  * cd "$WORKTREE_PATH"
@@ -291,7 +291,7 @@ contract ZKCStartEpochs is BaseDeployment {
  * Sample Usage for veZKC upgrade:
  *
  * # First, create reference build from deployed veZKC commit:
- * export DEPLOYED_COMMIT=$(python3 -c "import tomlkit; print(tomlkit.load(open('deployment.toml'))['deployment']['$CHAIN_KEY']['vezkc-commit'])")
+ * export DEPLOYED_COMMIT=$(python3 -c "import tomllib; print(tomllib.load(open('deployment.toml', 'rb'))['deployment']['$CHAIN_KEY']['vezkc-commit'])")
  * WORKTREE_PATH="../vezkc-reference-${DEPLOYED_COMMIT}"
  * git worktree add "$WORKTREE_PATH" "$DEPLOYED_COMMIT"
  * cd "$WORKTREE_PATH"
@@ -370,7 +370,7 @@ contract UpgradeVeZKC is BaseDeployment {
  * Sample Usage for StakingRewards upgrade:
  *
  * # First, create reference build from deployed StakingRewards commit:
- * export DEPLOYED_COMMIT=$(python3 -c "import tomlkit; print(tomlkit.load(open('deployment.toml'))['deployment']['$CHAIN_KEY']['staking-rewards-commit'])")
+ * export DEPLOYED_COMMIT=$(python3 -c "import tomllib; print(tomllib.load(open('deployment.toml', 'rb'))['deployment']['$CHAIN_KEY']['staking-rewards-commit'])")
  * WORKTREE_PATH="../staking-rewards-reference-${DEPLOYED_COMMIT}"
  * git worktree add "$WORKTREE_PATH" "$DEPLOYED_COMMIT"
  * cd "$WORKTREE_PATH"
@@ -4,15 +4,65 @@ Update deployment.toml with contract addresses and deployment information.
 
 This script allows updating specific fields in the deployment.toml configuration
 for a given chain key. It preserves existing values and only updates provided fields.
+
+With --batch-stdin, updates for several chains are read from stdin as a JSON
+object of the form {"<chain-key>": {"<field>": "<value>", ...}, ...} and applied
+in a single read/write of deployment.toml. Fields must be ones accepted as
+--<field> flags and values must be strings (or null to skip). Batch updates are
+applied on top of any --<field> flags, so if the same field is set for the
+--chain-key chain in both, the batch value wins.
 """
 
 import argparse
+import json
+import os
+import shutil
 import sys
-import tomlkit
 from pathlib import Path
 
 
-def main():
+# Fields that can be set with a --<field> flag, with their help text
+FIELDS = (
+    # Contract addresses
+    ('admin', 'Admin address'),
+    ('zkc-admin', 'ZKC admin address'),
+    ('zkc-admin-2', 'ZKC secondary admin address'),
+    ('vezkc-admin', 'veZKC admin address'),
+    ('vezkc-admin-2', 'veZKC secondary admin address'),
+    ('staking-rewards-admin', 'StakingRewards admin address'),
+    ('staking-rewards-admin-2', 'StakingRewards secondary admin address'),
+    ('supply-calculator-admin-2', 'SupplyCalculator secondary admin address'),
+    ('zkc', 'ZKC proxy address'),
+    ('zkc-impl', 'ZKC implementation address'),
+    ('zkc-impl-prev', 'Previous ZKC implementation address'),
+    ('zkc-deployer', 'ZKC deployer address'),
+    ('vezkc', 'veZKC proxy address'),
+    ('vezkc-impl', 'veZKC implementation address'),
+    ('vezkc-impl-prev', 'Previous veZKC implementation address'),
+    ('vezkc-deployer', 'veZKC deployer address'),
+    ('staking-rewards', 'StakingRewards proxy address'),
+    ('staking-rewards-impl', 'StakingRewards implementation address'),
+    ('staking-rewards-impl-prev', 'Previous StakingRewards implementation address'),
+    ('staking-rewards-deployer', 'StakingRewards deployer address'),
+    ('povw-minter', 'POVW minter address'),
+    ('staking-minter', 'Staking minter address'),
+    ('supply-calculator', 'SupplyCalculator proxy address'),
+    ('supply-calculator-impl', 'SupplyCalculator implementation address'),
+    ('supply-calculator-admin', 'SupplyCalculator admin address'),
+    # Deployment metadata
+    ('zkc-commit', 'Git commit hash for ZKC deployment'),
+    ('vezkc-commit', 'Git commit hash for veZKC deployment'),
+    ('staking-rewards-commit', 'Git commit hash for StakingRewards deployment'),
+    ('supply-calculator-commit', 'Git commit hash for SupplyCalculator deployment'),
+    ('rpc-url', 'RPC URL for the network'),
+    ('etherscan-api-key', 'Etherscan API key'),
+)
+
+# argparse dest name -> TOML field name
+_FIELD_TO_TOML = {field.replace('-', '_'): field for field, _ in FIELDS}
+
+
+def build_parser():
     parser = argparse.ArgumentParser(
         description='Update deployment.toml with contract addresses'
     )
@@ -23,148 +73,153 @@ def main():
         default='anvil', 
         help='Chain key in deployment.toml (default: anvil)'
     )
+    parser.add_argument(
+        '--batch-stdin',
+        action='store_true',
+        help='Read additional updates as JSON from stdin: {"<chain-key>": {"<field>": "<value>"}}; '
+             'batch values override --<field> flags for the same chain and field'
+    )
     
-    # Contract addresses
-    parser.add_argument('--admin', help='Admin address')
-    parser.add_argument('--zkc-admin', help='ZKC admin address')
-    parser.add_argument('--zkc-admin-2', help='ZKC secondary admin address')
-    parser.add_argument('--vezkc-admin', help='veZKC admin address')
-    parser.add_argument('--vezkc-admin-2', help='veZKC secondary admin address')
-    parser.add_argument('--staking-rewards-admin', help='StakingRewards admin address')
-    parser.add_argument('--staking-rewards-admin-2', help='StakingRewards secondary admin address')
-    parser.add_argument('--supply-calculator-admin-2', help='SupplyCalculator secondary admin address')
+    # Contract addresses and deployment metadata
+    for field, help_text in FIELDS:
+        parser.add_argument(f'--{field}', help=help_text)
+    
+    return parser
 
-    parser.add_argument('--zkc', help='ZKC proxy address')
-    parser.add_argument('--zkc-impl', help='ZKC implementation address')
-    parser.add_argument('--zkc-impl-prev', help='Previous ZKC implementation address')
-    parser.add_argument('--zkc-deployer', help='ZKC deployer address')
-    parser.add_argument('--vezkc', help='veZKC proxy address')
-    parser.add_argument('--vezkc-impl', help='veZKC implementation address')
-    parser.add_argument('--vezkc-impl-prev', help='Previous veZKC implementation address')
-    parser.add_argument('--vezkc-deployer', help='veZKC deployer address')
-    parser.add_argument('--staking-rewards', help='StakingRewards proxy address')
-    parser.add_argument('--staking-rewards-impl', help='StakingRewards implementation address')
-    parser.add_argument('--staking-rewards-impl-prev', help='Previous StakingRewards implementation address')
-    parser.add_argument('--staking-rewards-deployer', help='StakingRewards deployer address')
-    parser.add_argument('--povw-minter', help='POVW minter address')
-    parser.add_argument('--staking-minter', help='Staking minter address')
-    parser.add_argument('--supply-calculator', help='SupplyCalculator proxy address')
-    parser.add_argument('--supply-calculator-impl', help='SupplyCalculator implementation address')
-    parser.add_argument('--supply-calculator-admin', help='SupplyCalculator admin address')
 
-    # Deployment metadata
-    parser.add_argument('--zkc-commit', help='Git commit hash for ZKC deployment')
-    parser.add_argument('--vezkc-commit', help='Git commit hash for veZKC deployment')
-    parser.add_argument('--staking-rewards-commit', help='Git commit hash for StakingRewards deployment')
-    parser.add_argument('--supply-calculator-commit', help='Git commit hash for SupplyCalculator deployment')
-    parser.add_argument('--rpc-url', help='RPC URL for the network')
-    parser.add_argument('--etherscan-api-key', help='Etherscan API key')
-    
-    args = parser.parse_args()
+def main():
+    args = build_parser().parse_args()
     
     # Validate chain key
     chain_key = args.chain_key
     if not chain_key:
-        print("❌ Chain key cannot be empty", file=sys.stderr)
+        sys.stderr.write("ERROR: Chain key cannot be empty\n")
         sys.exit(1)
     
+    # Collect provided values under their TOML field names, stripping
+    # whitespace (especially important for git commits)
+    arg_values = vars(args)
+    updates = {
+        toml_field: value.strip()
+        for field, toml_field in _FIELD_TO_TOML.items()
+        if (value := arg_values[field]) is not None
+    }
+    
+    # Updates to apply, grouped by chain key
+    chain_updates = {chain_key: updates} if updates else {}
+    
+    if args.batch_stdin:
+        try:
+            batch = json.load(sys.stdin)
+        except json.JSONDecodeError as e:
+            sys.stderr.write(f"ERROR: Invalid JSON on stdin: {e}\n")
+            sys.exit(1)
+        
+        if not isinstance(batch, dict) or not all(isinstance(v, dict) for v in batch.values()):
+            sys.stderr.write("ERROR: Batch input must map chain keys to objects of field values\n")
+            sys.exit(1)
+        
+        for batch_chain_key, fields in batch.items():
+            batch_updates = chain_updates.setdefault(batch_chain_key, {})
+            for field, value in fields.items():
+                # Accept both the flag form (zkc-impl) and the dest form (zkc_impl)
+                toml_field = _FIELD_TO_TOML.get(field.replace('-', '_'))
+                if toml_field is None:
+                    sys.stderr.write(f"ERROR: Unknown field '{field}' for chain '{batch_chain_key}' in batch input\n")
+                    sys.exit(1)
+                if value is None:
+                    continue
+                if not isinstance(value, str):
+                    sys.stderr.write(f"ERROR: Value for '{field}' on chain '{batch_chain_key}' must be a string or null\n")
+                    sys.exit(1)
+                batch_updates[toml_field] = value.strip()
+        chain_updates = {key: fields for key, fields in chain_updates.items() if fields}
+    
+    # Nothing to do, so skip reading and rewriting the file
+    if not chain_updates:
+        print("INFO: No updates provided, deployment.toml unchanged")
+        return
+    
     # Find deployment.toml file
     toml_path = Path('deployment.toml')
     if not toml_path.exists():
-        print("❌ deployment.toml not found in current directory", file=sys.stderr)
+        sys.stderr.write("ERROR: deployment.toml not found in current directory\n")
         sys.exit(1)
     
+    # Imported here so no-op and invalid invocations skip the cost of loading tomlkit
+    import tomlkit
+    
     try:
-        # Load existing TOML
-        with open(toml_path, 'r') as f:
-            doc = tomlkit.load(f)
+        # Load existing TOML, decoding the whole file in one go. CRLF is
+        # normalized to LF, as text mode did, so appended keys do not leave the
+        # file with mixed line endings.
+        doc = tomlkit.parse(toml_path.read_bytes().decode('utf-8').replace('\r\n', '\n'))
         
         # Ensure deployment section exists
-        if 'deployment' not in doc:
-            doc['deployment'] = tomlkit.table()
+        deployment = doc.setdefault('deployment', {})
         
-        # Ensure chain key section exists
-        if chain_key not in doc['deployment']:
-            print(f"❌ Chain key '{chain_key}' not found in deployment.toml", file=sys.stderr)
-            print(f"Available chains: {list(doc['deployment'].keys())}", file=sys.stderr)
-            sys.exit(1)
+        # Ensure every chain key section exists before changing anything
+        for key in chain_updates:
+            if key not in deployment:
+                sys.stderr.write(f"ERROR: Chain key '{key}' not found in deployment.toml\n")
+                sys.stderr.write(f"Available chains: {list(deployment.keys())}\n")
+                sys.exit(1)
         
-        # Track updates made
-        updates = {}
+        # Drop values that already match what is stored
+        for key in list(chain_updates):
+            table = deployment[key]
+            changed = {
+                field: value for field, value in chain_updates[key].items()
+                if table.get(field) != value
+            }
+            if changed:
+                chain_updates[key] = changed
+            else:
+                del chain_updates[key]
         
-
-        # Update provided values
-        field_mappings = {
-            'admin': args.admin,
-            'zkc_admin': args.zkc_admin,
-            'zkc_admin_2': args.zkc_admin_2,
-            'vezkc_admin': args.vezkc_admin,
-            'vezkc_admin_2': args.vezkc_admin_2,
-            'staking_rewards_admin': args.staking_rewards_admin,
-            'staking_rewards_admin_2': args.staking_rewards_admin_2,
-            'supply_calculator_admin_2': args.supply_calculator_admin_2,
-            'zkc': args.zkc,
-            'zkc_impl': args.zkc_impl,
-            'zkc_impl_prev': args.zkc_impl_prev,
-            'zkc_deployer': args.zkc_deployer,
-            'vezkc': args.vezkc,
-            'vezkc_impl': args.vezkc_impl,
-            'vezkc_impl_prev': args.vezkc_impl_prev,
-            'vezkc_deployer': args.vezkc_deployer,
-            'staking_rewards': args.staking_rewards,
-            'staking_rewards_impl': args.staking_rewards_impl,
-            'staking_rewards_impl_prev': args.staking_rewards_impl_prev,
-            'staking_rewards_deployer': args.staking_rewards_deployer,
-            'povw_minter': args.povw_minter,
-            'staking_minter': args.staking_minter,
-            'supply_calculator': args.supply_calculator,
-            'supply_calculator_impl': args.supply_calculator_impl,
-            'supply_calculator_admin': args.supply_calculator_admin,
-            'zkc_commit': args.zkc_commit,
-            'vezkc_commit': args.vezkc_commit,
-            'staking_rewards_commit': args.staking_rewards_commit,
-            'supply_calculator_commit': args.supply_calculator_commit,
-            'rpc_url': args.rpc_url,
-            'etherscan_api_key': args.etherscan_api_key,
-        }
+        if not chain_updates:
+            print("INFO: All values already up to date, deployment.toml unchanged")
+            return
         
-        for field, value in field_mappings.items():
-            if value is not None:
-                # Convert field name to TOML format
-                toml_field = field.replace('_', '-')
-                
-                # Strip whitespace from the value (especially important for git commits)
-                if isinstance(value, str):
-                    value = value.strip()
-                
-                # Update the value
-                doc['deployment'][chain_key][toml_field] = value
-                updates[toml_field] = value
+        # Apply all values to each chain table in one update
+        for key, fields in chain_updates.items():
+            deployment[key].update(fields)
         
-        # Write back to file
-        with open(toml_path, 'w') as f:
-            tomlkit.dump(doc, f)
+        # Write back to file atomically so an interrupted run cannot truncate it,
+        # syncing the new contents to disk before they replace the original.
+        # Resolve symlinks so the link target is replaced rather than the link,
+        # and keep the original file's permissions on the replacement.
+        target_path = toml_path.resolve()
+        tmp_path = target_path.with_suffix('.toml.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(tomlkit.dumps(doc).encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+            shutil.copymode(target_path, tmp_path)
+            os.replace(tmp_path, target_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
         
         # Print updates
-        if updates:
-            print(f"✅ Updated deployment.toml for chain '{chain_key}':")
-            for key, value in updates.items():
+        for key, fields in chain_updates.items():
+            print(f"OK: Updated deployment.toml for chain '{key}':")
+            for field, value in fields.items():
                 # Truncate long values (like addresses) for display
                 display_value = value
                 if isinstance(value, str) and len(value) > 50:
                     display_value = f"{value[:10]}...{value[-10:]}"
-                print(f"   {key} = {display_value}")
-        else:
-            print("ℹ️  No updates provided, deployment.toml unchanged")
+                print(f"   {field} = {display_value}")
         
     except tomlkit.exceptions.TOMLKitError as e:
-        print(f"❌ Error parsing deployment.toml: {e}", file=sys.stderr)
+        sys.stderr.write(f"ERROR: Could not parse deployment.toml: {e}\n")
         sys.exit(1)
     except KeyError as e:
-        print(f"❌ Missing key in deployment.toml: {e}", file=sys.stderr)
+        sys.stderr.write(f"ERROR: Missing key in deployment.toml: {e}\n")
         sys.exit(1)
     except Exception as e:
-        print(f"❌ Unexpected error: {e}", file=sys.stderr)
+        sys.stderr.write(f"ERROR: Unexpected error: {e}\n")
         sys.exit(1)
 
 